@@ -0,0 +1,112 @@
+"""
+Benchmark des backends de parsing HTML sur des pages Alibaba sauvegardées.
+
+Usage :
+    python scripts/bench_parsers.py pages/produit1.html pages/profil1.html
+    python scripts/bench_parsers.py dossier_pages/ --runs 5 --parsers html.parser lxml
+
+Pour chaque backend : temps de parsing + temps d'extraction
+(_extract_product_alibaba / _extract_supplier_from_alibaba), et comparaison
+du résultat avec celui de "html.parser" (la référence actuelle).
+On ne retient que les backends qui donnent EXACTEMENT la même extraction.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import app  # noqa: E402
+
+REFERENCE_PARSER = "html.parser"
+DEFAULT_PARSERS = ["html.parser", "lxml", "html5lib"]
+
+
+def _iter_pages(paths):
+    for p in paths:
+        p = Path(p)
+        if p.is_dir():
+            yield from sorted(x for x in p.rglob("*") if x.suffix in (".html", ".htm"))
+        elif p.is_file():
+            yield p
+
+
+def _available(parser: str) -> bool:
+    return app._resolve_html_parser(parser) == parser
+
+
+def _run_once(html: str, parser: str):
+    t0 = time.perf_counter()
+    page = app.PageContext(soup=app._make_soup(html, parser))
+    t1 = time.perf_counter()
+    extracted = {
+        "product": app._extract_product_alibaba(page),
+        "supplier": app._extract_supplier_from_alibaba(page),
+    }
+    t2 = time.perf_counter()
+    return t1 - t0, t2 - t1, extracted
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("pages", nargs="+", help="fichiers .html ou dossiers")
+    ap.add_argument("--runs", type=int, default=3, help="répétitions par page (médiane)")
+    ap.add_argument("--parsers", nargs="+", default=DEFAULT_PARSERS)
+    args = ap.parse_args()
+
+    pages = list(_iter_pages(args.pages))
+    if not pages:
+        print("Aucune page trouvée.")
+        return 1
+
+    parsers = [p for p in args.parsers if _available(p)]
+    if REFERENCE_PARSER not in parsers:
+        parsers.insert(0, REFERENCE_PARSER)
+
+    stats = {p: {"parse": [], "extract": [], "same": 0} for p in parsers}
+
+    for page in pages:
+        html = page.read_bytes().decode("utf-8", errors="replace")
+        # Référence calculée d'abord, quel que soit l'ordre de --parsers
+        _, _, reference = _run_once(html, REFERENCE_PARSER)
+        for parser in parsers:
+            parse_times, extract_times = [], []
+            extracted = None
+            for _ in range(max(1, args.runs)):
+                t_parse, t_extract, extracted = _run_once(html, parser)
+                parse_times.append(t_parse)
+                extract_times.append(t_extract)
+
+            stats[parser]["parse"].append(statistics.median(parse_times))
+            stats[parser]["extract"].append(statistics.median(extract_times))
+            if extracted == reference:
+                stats[parser]["same"] += 1
+            else:
+                print(f"  ≠ {page.name} : résultat différent avec {parser}")
+
+    print()
+    print(f"{len(pages)} page(s), {args.runs} run(s) par page (médiane, en ms, somme sur les pages)")
+    print(f"{'parseur':<14}{'parsing':>10}{'extraction':>12}{'total':>10}{'identiques':>12}")
+    best = None
+    for parser in parsers:
+        st = stats[parser]
+        parse_ms = sum(st["parse"]) * 1000
+        extract_ms = sum(st["extract"]) * 1000
+        total = parse_ms + extract_ms
+        print(f"{parser:<14}{parse_ms:>10.1f}{extract_ms:>12.1f}{total:>10.1f}{st['same']:>8}/{len(pages)}")
+        if st["same"] == len(pages) and (best is None or total < best[1]):
+            best = (parser, total)
+
+    print()
+    if best is None:
+        print(f"Aucun backend ne donne toujours la même extraction : garder HTML_PARSER={REFERENCE_PARSER}")
+        return 1
+    print(f"Backend conseillé (le plus rapide à résultat identique) : HTML_PARSER={best[0]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Micro-benchmark de la recherche des métriques fournisseur.
+
+Compare, sur le texte de grosses pages :
+  - "avant" : un re.search par métrique sur toute la page (ancien code) ;
+  - "après" : _metric() (motifs précompilés, recherche ancrée sur les mots
+    fixes pour les motifs "chiffres + mot", saut des motifs absents de la page).
+Vérifie au passage que les deux donnent exactement les mêmes matchs.
+
+Usage :
+    python scripts/bench_supplier_scan.py                    # page synthétique de 2 Mo
+    python scripts/bench_supplier_scan.py pages/*.html --runs 20
+    python scripts/bench_supplier_scan.py --synthetic-mb 5
+"""
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import app  # noqa: E402
+
+WORDS = (
+    "led lamp warm white bulb aluminium housing factory price wholesale "
+    "customized logo packing carton shipping sample lead time pieces set "
+    "color size model watt voltage lumen cri beam angle certificate"
+).split()
+
+
+def _synthetic_html(size_mb: float) -> str:
+    rnd = random.Random(42)
+    target = int(size_mb * 1024 * 1024)
+    parts = ["<html><body><h1>LED Lamp 12W</h1>"]
+    total = 0
+    while total < target:
+        words = " ".join(rnd.choice(WORDS) for _ in range(20))
+        chunk = f"<div class='item'><p>{words} {rnd.randint(1, 9999)} pcs {rnd.randint(1, 48)}h</p></div>"
+        parts.append(chunk)
+        total += len(chunk)
+    parts.append(
+        "<div class='company-card'>Verified Supplier 7 yrs on Alibaba.com 4.8/5 "
+        "(88 reviews) 97.5% On-time delivery rate ≤3h Response time "
+        "US$ 1,000,000+ Online revenue 120 employees 5000 m²</div></body></html>"
+    )
+    return "".join(parts)
+
+
+def _scan_legacy(page):
+    """Ancien comportement : chaque motif parcourt toute la page."""
+    out = {}
+    for name, (pattern, source, _keywords, _prefix) in app._SUPPLIER_METRICS.items():
+        text = page.full_text if source == "full" else page.lower_text
+        out[name] = re.search(pattern.pattern, text, pattern.flags)
+    return out
+
+
+def _scan_new(page):
+    page.metric_matches = {}
+    return {name: app._metric(page, name) for name in app._SUPPLIER_METRICS}
+
+
+def _same(a, b) -> bool:
+    for name in a:
+        ma, mb = a[name], b[name]
+        if (ma is None) != (mb is None):
+            return False
+        if ma is not None and (ma.span() != mb.span() or ma.groups() != mb.groups()):
+            return False
+    return True
+
+
+def _time(fn, page, runs):
+    times = []
+    result = None
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        result = fn(page)
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times), result
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("pages", nargs="*", help="fichiers .html (sinon page synthétique)")
+    ap.add_argument("--runs", type=int, default=10)
+    ap.add_argument("--synthetic-mb", type=float, default=2.0)
+    args = ap.parse_args()
+
+    if args.pages:
+        docs = [(Path(p).name, Path(p).read_bytes().decode("utf-8", errors="replace")) for p in args.pages]
+    else:
+        docs = [(f"synthétique {args.synthetic_mb:g} Mo", _synthetic_html(args.synthetic_mb))]
+
+    ok = True
+    print(f"{'page':<32}{'texte':>10}{'avant (ms)':>12}{'après (ms)':>12}{'gain':>8}")
+    for label, html in docs:
+        page = app.PageContext(html=html)
+        page.lower_text  # texte calculé hors chrono (commun aux deux versions)
+
+        t_old, res_old = _time(_scan_legacy, page, args.runs)
+        t_new, res_new = _time(_scan_new, page, args.runs)
+        same = _same(res_old, res_new)
+        ok = ok and same
+
+        size_kb = len(page.full_text) / 1024
+        print(
+            f"{label[:31]:<32}{size_kb:>8.0f}Ko{t_old * 1000:>12.2f}{t_new * 1000:>12.2f}"
+            f"{t_old / max(t_new, 1e-9):>7.1f}x{'' if same else '  ≠ RÉSULTATS DIFFÉRENTS'}"
+        )
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
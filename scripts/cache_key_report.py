@@ -0,0 +1,98 @@
+"""
+Taux de hit du cache produit : lien brut vs identité canonique.
+
+Rejoue les liens analysés trouvés dans les logs (lignes "DEBUG: analyse_url …"
+écrites par analyse_alibaba_url, ou toute ligne contenant un lien Alibaba avec
+--grep "") et simule le cache avec deux clés :
+  - "brut"      : product_url.strip() (ancienne clé) ;
+  - "canonique" : alibaba_url_identity() (product:<id>, company:<slug>/…).
+
+Usage :
+    python scripts/cache_key_report.py gunicorn.log
+    heroku logs -n 5000 | python scripts/cache_key_report.py --capacity 5000
+    python scripts/cache_key_report.py vieux.log --grep "" --top 20
+"""
+import argparse
+import re
+import sys
+from collections import Counter, OrderedDict, defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import app  # noqa: E402
+
+_URL_RE = re.compile(r"https?://[^\s\"'<>]*alibaba\.com[^\s\"'<>]*", re.IGNORECASE)
+
+
+def _iter_urls(paths, marker):
+    files = [open(p, encoding="utf-8", errors="replace") for p in paths] or [sys.stdin]
+    for f in files:
+        for line in f:
+            if marker and marker not in line:
+                continue
+            m = _URL_RE.search(line)
+            if m:
+                yield m.group(0).rstrip(".,;)")
+
+
+def _simulate(keys, capacity):
+    """Cache LRU sans expiration (capacity=0 → illimité) : nombre de hits."""
+    cache = OrderedDict()
+    hits = 0
+    for key in keys:
+        if key in cache:
+            hits += 1
+            cache.move_to_end(key)
+            continue
+        cache[key] = True
+        if capacity and len(cache) > capacity:
+            cache.popitem(last=False)
+    return hits
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("logs", nargs="*", help="fichiers de log (défaut : entrée standard)")
+    ap.add_argument("--grep", default="analyse_url", help='ne lire que les lignes contenant ce texte ("" = toutes)')
+    ap.add_argument("--capacity", type=int, default=0, help="taille max du cache simulé (0 = illimité)")
+    ap.add_argument("--top", type=int, default=10, help="identités les plus fusionnées à afficher")
+    args = ap.parse_args()
+
+    urls = list(_iter_urls(args.logs, args.grep))
+    if not urls:
+        print("Aucun lien Alibaba trouvé dans les logs.", file=sys.stderr)
+        return 1
+
+    raw_keys = [u.strip() for u in urls]
+    canonical_keys = [app.alibaba_url_identity(u) for u in urls]
+
+    total = len(urls)
+    print(f"{total} analyse(s) dans les logs")
+    print(f"{'clé':<12}{'clés distinctes':>17}{'hits':>8}{'taux de hit':>14}")
+    rates = []
+    for label, keys in (("brut", raw_keys), ("canonique", canonical_keys)):
+        hits = _simulate(keys, args.capacity)
+        rates.append(hits / total)
+        print(f"{label:<12}{len(set(keys)):>17}{hits:>8}{hits / total:>13.1%}")
+    print(f"Gain : {rates[1] - rates[0]:+.1%} de hits")
+
+    variants = defaultdict(set)
+    for raw, key in zip(raw_keys, canonical_keys):
+        variants[key].add(raw)
+    counts = Counter(canonical_keys)
+    merged = sorted(
+        (k for k in variants if len(variants[k]) > 1),
+        key=lambda k: (-len(variants[k]), -counts[k]),
+    )
+    if merged and args.top:
+        print()
+        print("Identités regroupant le plus de variantes de lien :")
+        for key in merged[: args.top]:
+            print(f"  {key}  ({len(variants[key])} variantes, {counts[key]} analyses)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
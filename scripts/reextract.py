@@ -0,0 +1,81 @@
+"""
+Ré-extraction en masse depuis le stock de pages brutes (raw_pages/).
+
+Après une correction d'extracteur, recalcule produit / fournisseur pour
+toutes les pages déjà téléchargées, sans aucun appel réseau, sur tous les
+cœurs (pool de processus). Résultat en NDJSON (une ligne par page).
+
+Usage :
+    python scripts/reextract.py > resultats.ndjson
+    python scripts/reextract.py --latest --kind product_page --workers 8 --out produits.ndjson
+    python scripts/reextract.py --store /data/raw_pages
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import app  # noqa: E402
+
+
+def _reextract_one(row: dict) -> dict:
+    out = dict(row)
+    try:
+        raw = app.raw_store_read(row["sha256"])
+        page = app.PageContext(raw=raw, encoding=row["encoding"], url=row["url"])
+        if row["kind"] == "product_page":
+            out["product"] = app._extract_product_alibaba(page)
+        out["supplier"] = app._extract_supplier_from_alibaba(page)
+        out["ok"] = True
+    except Exception as e:
+        out["ok"] = False
+        out["error"] = str(e)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--store", default=app.RAW_STORE_DIR, help="dossier du stock (RAW_STORE_DIR)")
+    ap.add_argument("--kind", choices=["product_page", "supplier_profile"], help="filtrer par type de page")
+    ap.add_argument("--latest", action="store_true", help="seulement le dernier téléchargement par URL")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    ap.add_argument("--out", help="fichier NDJSON (défaut : sortie standard)")
+    args = ap.parse_args()
+
+    app.RAW_STORE_DIR = args.store
+    os.environ["RAW_STORE_DIR"] = args.store  # processus fils lancés en "spawn"
+    rows = list(app.raw_store_iter(kind=args.kind, latest_only=args.latest))
+    if not rows:
+        print("Stock vide.", file=sys.stderr)
+        return 1
+
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    started = time.monotonic()
+    errors = 0
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for result in pool.map(_reextract_one, rows, chunksize=8):
+                if not result["ok"]:
+                    errors += 1
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.monotonic() - started
+    print(
+        f"{len(rows)} page(s) ré-extraite(s) en {elapsed:.1f}s "
+        f"({len(rows) / max(elapsed, 1e-9):.1f} pages/s), {errors} erreur(s).",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
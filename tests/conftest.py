@@ -0,0 +1,84 @@
+"""
+Fixtures communes : serveur HTTP local (stand-in d'Alibaba) et état
+limiteur / disjoncteur remis à zéro pour chaque test.
+"""
+import http.server
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from urllib.parse import urlparse
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# app.py ouvre cache.db (et raw_pages/) dans le dossier courant : on isole les tests
+os.chdir(tempfile.mkdtemp(prefix="prodyscan-tests-"))
+os.environ.setdefault("RAW_STORE_ENABLED", "0")
+os.environ.setdefault("REFRESH_AHEAD_ENABLED", "0")
+
+import app  # noqa: E402
+
+
+class StandIn:
+    """
+    Serveur HTTP local. routes : chemin -> (statut, corps, en-têtes) ;
+    hits : chemins demandés, dans l'ordre. Chemin inconnu → 404.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.hits = []
+        stand_in = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                path = urlparse(self.path).path
+                stand_in.hits.append(path)
+                status, body, headers = stand_in.routes.get(path, (404, b"", {}))
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def route(self, path: str, status: int = 200, body: bytes = b"ok", headers: dict = None):
+        self.routes[path] = (status, body, headers or {"Content-Type": "text/html; charset=utf-8"})
+        return self.url + path
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stand_in():
+    server = StandIn()
+    yield server
+    server.close()
+
+
+@pytest.fixture(autouse=True)
+def fresh_upstream(monkeypatch):
+    """Limiteurs / disjoncteurs neufs et réglages rapides pour chaque test."""
+    monkeypatch.setattr(app, "_host_guards", {})
+    monkeypatch.setattr(app, "UPSTREAM_RATE_PER_SECOND", 0.0)
+    monkeypatch.setattr(app, "BREAKER_FAILURE_THRESHOLD", 3)
+    monkeypatch.setattr(app, "BREAKER_COOLDOWN_SECONDS", 30.0)
@@ -0,0 +1,240 @@
+"""
+Limiteur de débit + disjoncteur par hôte (_HostGuard / _http_get),
+contre un serveur HTTP local.
+"""
+import time
+
+import pytest
+
+import app
+
+
+def test_token_bucket_paces_requests(stand_in, monkeypatch):
+    monkeypatch.setattr(app, "UPSTREAM_RATE_PER_SECOND", 10.0)
+    monkeypatch.setattr(app, "UPSTREAM_BURST", 1.0)
+    url = stand_in.route("/page")
+
+    started = time.monotonic()
+    for _ in range(6):
+        assert app._http_get(url).status_code == 200
+    elapsed = time.monotonic() - started
+
+    # 1 jeton tout de suite, puis 1 toutes les 100 ms
+    assert elapsed >= 0.45
+    assert len(stand_in.hits) == 6
+
+
+def test_token_bucket_rejects_instead_of_waiting_too_long(stand_in, monkeypatch):
+    monkeypatch.setattr(app, "UPSTREAM_RATE_PER_SECOND", 1.0)
+    monkeypatch.setattr(app, "UPSTREAM_BURST", 1.0)
+    monkeypatch.setattr(app, "UPSTREAM_MAX_WAIT_SECONDS", 0.1)
+    url = stand_in.route("/page")
+
+    app._http_get(url)
+    with pytest.raises(app.UpstreamUnavailable):
+        app._http_get(url)
+    assert len(stand_in.hits) == 1
+    assert app._host_guard(url).snapshot()["rejected"] == 1
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_breaker_trips_after_consecutive_failures(stand_in, status):
+    url = stand_in.route("/page", status=status)
+
+    for _ in range(app.BREAKER_FAILURE_THRESHOLD):
+        assert app._http_get(url).status_code == status
+
+    # Coupé : échec immédiat, sans requête envoyée
+    with pytest.raises(app.UpstreamUnavailable):
+        app._http_get(url)
+    assert len(stand_in.hits) == app.BREAKER_FAILURE_THRESHOLD
+
+    snap = app._host_guard(url).snapshot()
+    assert snap["state"] == "open"
+    assert snap["trips"] == 1
+    assert snap["last_error"] == f"HTTP {status}"
+
+
+def test_success_resets_failure_count(stand_in):
+    bad = stand_in.route("/bad", status=500)
+    good = stand_in.route("/good")
+
+    for _ in range(app.BREAKER_FAILURE_THRESHOLD - 1):
+        app._http_get(bad)
+    app._http_get(good)
+    app._http_get(bad)
+
+    assert app._host_guard(bad).snapshot()["state"] == "closed"
+
+
+def _trip(url):
+    for _ in range(app.BREAKER_FAILURE_THRESHOLD):
+        app._http_get(url)
+    assert app._host_guard(url).snapshot()["state"] == "open"
+
+
+def test_half_open_lets_one_probe_through_and_recloses(stand_in, monkeypatch):
+    monkeypatch.setattr(app, "BREAKER_COOLDOWN_SECONDS", 0.2)
+    url = stand_in.route("/page", status=429)
+    _trip(url)
+    time.sleep(0.25)
+
+    guard = app._host_guard(url)
+    guard.acquire()  # requête d'essai
+    assert guard.snapshot()["state"] == "half_open"
+    with pytest.raises(app.UpstreamUnavailable):
+        guard.acquire()  # une seule à la fois
+    guard.record(True)
+    assert guard.snapshot()["state"] == "closed"
+
+    stand_in.route("/page")
+    assert app._http_get(url).status_code == 200
+
+
+def test_failed_probe_reopens_the_breaker(stand_in, monkeypatch):
+    monkeypatch.setattr(app, "BREAKER_COOLDOWN_SECONDS", 0.2)
+    url = stand_in.route("/page", status=503)
+    _trip(url)
+    time.sleep(0.25)
+
+    hits = len(stand_in.hits)
+    assert app._http_get(url).status_code == 503  # la requête d'essai part
+    assert len(stand_in.hits) == hits + 1
+
+    snap = app._host_guard(url).snapshot()
+    assert snap["state"] == "open"
+    assert snap["trips"] == 2
+    with pytest.raises(app.UpstreamUnavailable):
+        app._http_get(url)
+
+
+def test_captcha_redirect_counts_as_failure(stand_in):
+    captcha = stand_in.route("/_____tmd_____/punish")
+    stand_in.route("/page", status=302, headers={"Location": captcha})
+    url = stand_in.url + "/page"
+
+    _trip(url)
+
+
+PRODUCT_HTML = b"""<html><body>
+<h1>LED Lamp 12W</h1>
+<div>4.8 (12 reviews) 300 sold US$ 1.50 - $ 2.00</div>
+</body></html>"""
+
+
+def _forget_results(monkeypatch):
+    """Vide le cache des résultats : la prochaine analyse repasse par le réseau."""
+    monkeypatch.setitem(
+        app.CACHE, "product_url", app.BoundedCache("product_url", 100, 10 ** 7, app._cache_hard_ttl())
+    )
+    monkeypatch.setattr(app, "SINGLE_FLIGHT_RESULT_TTL", 0)
+    with app._db_lock:
+        app._conn.execute("DELETE FROM scrape_cache")
+        app._conn.commit()
+
+
+def test_analyse_serves_last_extraction_when_host_is_cut(stand_in, monkeypatch):
+    url = stand_in.route("/product-fallback.html", body=PRODUCT_HTML, headers={
+        "Content-Type": "text/html; charset=utf-8",
+        "ETag": '"v1"',
+    })
+    first = app.analyse_alibaba_url(url)
+    assert first["product"]["title"] == "LED Lamp 12W"
+
+    _forget_results(monkeypatch)
+    guard = app._host_guard(url)
+    for _ in range(app.BREAKER_FAILURE_THRESHOLD):
+        guard.record(False, "HTTP 429")
+    hits = len(stand_in.hits)
+
+    started = time.monotonic()
+    again = app.analyse_alibaba_url(url)
+    assert time.monotonic() - started < 1.0  # pas d'attente réseau
+    assert len(stand_in.hits) == hits
+    assert again["product"] == first["product"]
+    assert guard.snapshot()["rejected"] >= 1
+
+
+def test_analyse_fails_fast_without_cached_page(stand_in, monkeypatch):
+    url = stand_in.route("/never-seen.html", body=PRODUCT_HTML)
+    guard = app._host_guard(url)
+    for _ in range(app.BREAKER_FAILURE_THRESHOLD):
+        guard.record(False, "HTTP 429")
+
+    started = time.monotonic()
+    with pytest.raises(RuntimeError):
+        app.analyse_alibaba_url(url)
+    assert time.monotonic() - started < 1.0
+    assert stand_in.hits == []
+
+
+def test_upstream_status_route(stand_in):
+    url = stand_in.route("/page", status=429)
+    app._http_get(url)
+
+    resp = app.app.test_client().get("/upstream_status")
+    assert resp.status_code == 200
+    payload = resp.get_json()
+    assert payload["ok"] is True
+
+    host = payload["hosts"]["127.0.0.1"]
+    assert host["state"] == "closed"
+    assert host["consecutive_failures"] == 1
+    assert host["requests"] == 1
+    assert host["failures"] == 1
+    assert host["last_error"] == "HTTP 429"
+    for key in ("retry_in_seconds", "tokens", "rejected", "trips"):
+        assert key in host
+
+
+def test_deadline_timeout_does_not_count_against_the_host(monkeypatch):
+    import socket
+    import threading
+
+    # Accepte la connexion mais ne répond jamais
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(8)
+    conns = []
+    stop = threading.Event()
+
+    def accept():
+        sock.settimeout(0.1)
+        while not stop.is_set():
+            try:
+                conns.append(sock.accept()[0])
+            except OSError:
+                pass
+
+    threading.Thread(target=accept, daemon=True).start()
+    url = f"http://127.0.0.1:{sock.getsockname()[1]}/slow"
+    try:
+        for _ in range(app.BREAKER_FAILURE_THRESHOLD + 1):
+            with pytest.raises(app.DeadlineExceeded):
+                app._http_get(url, deadline=app.Deadline(0.7))
+    finally:
+        stop.set()
+        for c in conns:
+            c.close()
+        sock.close()
+
+    snap = app._host_guard(url).snapshot()
+    assert snap["state"] == "closed"
+    assert snap["failures"] == 0
+
+
+def test_profile_skipped_for_lack_of_time_marks_result_partial(stand_in):
+    # Moins de DEADLINE_MIN_REQUEST_SECONDS restantes : le profil n'est même
+    # pas demandé, sans que le budget soit tout à fait écoulé
+    url = stand_in.route("/product-short.html", body=PRODUCT_HTML.replace(
+        b"</body>", b'<a href="https://acme.en.alibaba.com/company_profile.html">Acme</a></body>'
+    ))
+    response = app.HTTP_SESSION.get(url)
+    deadline = app.Deadline(app.DEADLINE_MIN_REQUEST_SECONDS - 0.2)
+
+    result = app._scrape_alibaba_url(url, "short-deadline", deadline, response=response)
+
+    assert not deadline.expired()
+    assert result["partial"] is True
+    assert result["supplier"]["profile_url"] == "https://acme.en.alibaba.com/company_profile.html"
+    assert result["product"]["title"] == "LED Lamp 12W"